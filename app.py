@@ -1,13 +1,27 @@
 from flask import Flask, request, jsonify, render_template
 from flask_cors import CORS
+import os
 import traceback
 from utils.visualization import generate_strength_graph
 from utils.hashcat import simulate_cracking
+from utils.cache import HashedLRUCache
 from models.genai import get_password_suggestions
+from models.entropy import PasswordFeatures
 
 app = Flask(__name__)
 CORS(app)
 
+# Opt-in cache of per-password analysis results, so repeated submissions
+# (e.g. a strength meter re-checking as the user types) skip recomputation.
+# Keys are salted hashes; passwords themselves are never stored.
+ANALYSIS_CACHE_ENABLED = os.environ.get("ENABLE_ANALYSIS_CACHE", "").lower() in ("1", "true", "yes")
+_analysis_cache = HashedLRUCache(maxsize=1024) if ANALYSIS_CACHE_ENABLED else None
+
+def _cached(func, password, *args):
+    if _analysis_cache is None:
+        return func(password, *args)
+    return _analysis_cache.get_or_compute(func, password, *args)
+
 # Root route to serve the main page
 @app.route("/", methods=["GET"])
 def home():
@@ -35,10 +49,13 @@ def analyze_password():
         if not password:
             return jsonify({"error": "Password is required"}), 400
 
-        strength_data = generate_strength_graph(password)
-        cracking_data = simulate_cracking(password)
+        # Character statistics shared by the strength graph and cracking simulation
+        features = PasswordFeatures.from_password(password)
+        strength_data = _cached(generate_strength_graph, password, features)
+        cracking_data = simulate_cracking(password, features)  # memoized in utils.hashcat
         
-        # Get password suggestions
+        # Get password suggestions; never cached, since the alternative
+        # passwords are fresh random credentials for each request
         security_level = data.get("security_level", 3)
         suggestions = get_password_suggestions(password, security_level)
 
@@ -89,4 +106,13 @@ def internal_error(error):
     return jsonify({"error": "Internal server error"}), 500
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
+    # Debug mode (reloader + debugger) only when explicitly developing; in
+    # production serve with gevent workers so slow OpenAI/hashcat calls
+    # don't block other requests:
+    #   gunicorn -k gevent -w 4 --worker-connections 200 app:app
+    if os.environ.get("DEV"):
+        app.run(debug=True, host="0.0.0.0", port=5000)
+    else:
+        print("ℹ️ Running the Flask server without debug mode (set DEV=1 for development).")
+        print("   For production use: gunicorn -k gevent -w 4 --worker-connections 200 app:app")
+        app.run(debug=False, threaded=True, host="0.0.0.0", port=5000)
@@ -1,39 +1,64 @@
-import random
+import mmap
 import string
+import numpy as np
 import pandas as pd
 
+rng = np.random.default_rng(42)
+
+WORDS = np.array(["Blue", "Sun", "Sky", "River", "Tech", "Data", "Secure", "Cloud", "Lion", "Mars"])
+SYMBOLS = np.array(["!", "@", "#", "$", "%", "&", "*"])
+EXTRA_CHARS = np.array(list(string.ascii_letters + string.digits))
+
 # ------------------------------
-# Helper: Generate humanized strong password
+# Helper: Generate humanized strong passwords
 # ------------------------------
-def generate_humanized_strong(length=12):
-    words = ["Blue", "Sun", "Sky", "River", "Tech", "Data", "Secure", "Cloud", "Lion", "Mars"]
-    password = random.choice(words) + str(random.randint(10, 99)) + random.choice(["!", "@", "#", "$", "%", "&", "*"])
-    
+def generate_humanized_strong(lengths):
+    """
+    Generate one humanized strong password per target length.
+    All random draws are made up front as NumPy arrays; only the final
+    per-password trim/pad is done in Python.
+    """
+    lengths = np.asarray(lengths)
+    n = len(lengths)
+
+    # word + 2-digit number + symbol, concatenated column-wise
+    base = (
+        pd.Series(WORDS[rng.integers(0, len(WORDS), n)])
+        + pd.Series(rng.integers(10, 100, n).astype(str))
+        + pd.Series(SYMBOLS[rng.integers(0, len(SYMBOLS), n)])
+    )
+
     # Sometimes make them shorter or longer for variety
-    if random.random() < 0.3:
-        password = password[:length]  
-    elif len(password) < length:
-        extra_chars = ''.join(random.choices(string.ascii_letters + string.digits, k=length - len(password)))
-        password += extra_chars
-    
-    return password
+    truncate = rng.random(n) < 0.3
+    pad_len = np.maximum(lengths - base.str.len().to_numpy(), 0)
+    max_pad = int(pad_len.max()) if n else 0
+    pads = EXTRA_CHARS[rng.integers(0, len(EXTRA_CHARS), (n, max_pad))]
+    pads = pads.view(f"<U{max_pad}").ravel() if max_pad else np.full(n, "")
+
+    return [
+        pwd[:length] if cut else pwd + pad[:extra]
+        for pwd, pad, length, extra, cut in zip(base, pads, lengths, pad_len, truncate)
+    ]
 
 # ------------------------------
 # Load Weak Passwords (RockYou)
 # ------------------------------
-with open("data/rockyou.txt", "r", encoding="latin-1", errors="ignore") as f:
-    weak_passwords = [line.strip() for line in f if line.strip()]
+# Map the file and split it in one C-level pass instead of iterating ~14M lines
+with open("data/rockyou.txt", "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+    raw = mm.read().decode("latin-1")
+weak_passwords = list(filter(None, raw.replace("\r\n", "\n").replace("\r", "\n").split("\n")))
+del raw
 
 # ------------------------------
 # Generate Strong Passwords
 # ------------------------------
-strong_passwords = [generate_humanized_strong(random.randint(10, 16)) for _ in range(100000)]
+strong_passwords = generate_humanized_strong(rng.integers(10, 17, 100000))
 
 # ------------------------------
 # Add "long weak" and "short strong" edge cases
 # ------------------------------
-long_weak = [pwd + "123" for pwd in random.sample(weak_passwords, 2000)]  # Long but weak
-short_strong = [generate_humanized_strong(8) for _ in range(2000)]  # Short but strong
+long_weak = [weak_passwords[i] + "123" for i in rng.choice(len(weak_passwords), 2000, replace=False)]  # Long but weak
+short_strong = generate_humanized_strong(np.full(2000, 8))  # Short but strong
 
 weak_passwords.extend(long_weak)
 strong_passwords.extend(short_strong)
@@ -42,37 +67,36 @@ strong_passwords.extend(short_strong)
 # Equal sampling for balance
 # ------------------------------
 sample_size = min(len(strong_passwords), len(weak_passwords))
-weak_sample = random.sample(weak_passwords, sample_size)
-strong_sample = random.sample(strong_passwords, sample_size)
+weak_sample = [weak_passwords[i] for i in rng.choice(len(weak_passwords), sample_size, replace=False)]
+strong_sample = [strong_passwords[i] for i in rng.choice(len(strong_passwords), sample_size, replace=False)]
 
 # ------------------------------
 # Label the data
 # ------------------------------
-labeled_data = [(pwd, 1) for pwd in weak_sample] + [(pwd, 0) for pwd in strong_sample]
+df = pd.DataFrame({
+    "password": weak_sample + strong_sample,
+    "label": np.concatenate([np.ones(sample_size, dtype=np.int64), np.zeros(sample_size, dtype=np.int64)]),
+})
 
 # Shuffle
-random.shuffle(labeled_data)
+df = df.iloc[rng.permutation(len(df))].reset_index(drop=True)
 
 # ------------------------------
 # Add 5% Label Noise
 # ------------------------------
-flip_count = int(0.05 * len(labeled_data))
-flip_indices = random.sample(range(len(labeled_data)), flip_count)
-for idx in flip_indices:
-    pwd, label = labeled_data[idx]
-    labeled_data[idx] = (pwd, 1 - label)
+flip_count = int(0.05 * len(df))
+flip_indices = rng.choice(len(df), flip_count, replace=False)
+df.loc[flip_indices, "label"] = 1 - df.loc[flip_indices, "label"]
 
 # ------------------------------
 # Save to TXT
 # ------------------------------
 with open("data/balanced_passwords.txt", "w", encoding="utf-8") as f:
-    for pwd, _ in labeled_data:
-        f.write(pwd + "\n")
+    f.write("\n".join(df["password"]) + "\n")
 
 # ------------------------------
 # Save to CSV
 # ------------------------------
-df = pd.DataFrame(labeled_data, columns=["password", "label"])
 df.to_csv("data/balanced_passwords.csv", index=False)
 
 print(f"✅ Balanced dataset created: {sample_size} weak + {sample_size} strong (with noise)")
@@ -1,62 +1,198 @@
 import os
-import re
+import string
+import threading
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.metrics import accuracy_score, classification_report
 import joblib
+from joblib import Parallel, delayed
+
+# Optional: run inference through ONNX Runtime when an exported model exists
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+# Characters counted by the 'has_special' feature
+_SPECIAL_CHARS = '!@#$%^&*(),.?":{}|<>'
+_SPECIAL_PATTERN = r'[!@#$%^&*(),.?":{}|<>]'
+
+# Translation table mapping every ASCII character to a class marker, so a
+# single str.translate followed by str.count does the counting in C.
+# Non-ASCII characters pass through unchanged and never match a marker.
+_DIGIT, _UPPER, _LOWER, _SPECIAL = '\x01', '\x02', '\x03', '\x04'
+_CHAR_CLASS_TABLE = dict.fromkeys(range(128), '\x00')
+for _chars, _marker in ((string.digits, _DIGIT), (string.ascii_uppercase, _UPPER),
+                        (string.ascii_lowercase, _LOWER), (_SPECIAL_CHARS, _SPECIAL)):
+    _CHAR_CLASS_TABLE.update(dict.fromkeys(map(ord, _chars), _marker))
+
+# Column order of the feature matrix, as produced by extract_features
+FEATURE_NAMES = [
+    'length', 'has_digits', 'has_lowercase', 'has_uppercase', 'has_special',
+    'digits_ratio', 'uppercase_ratio', 'unique_char_ratio',
+]
+
+def _batch_features(passwords):
+    """Feature matrix for a Series of passwords, built column-wise with pandas string ops."""
+    length = passwords.str.len().to_numpy(dtype=np.float64)
+    n_digit = passwords.str.count(r'[0-9]').to_numpy(dtype=np.float64)
+    n_lower = passwords.str.count(r'[a-z]').to_numpy(dtype=np.float64)
+    n_upper = passwords.str.count(r'[A-Z]').to_numpy(dtype=np.float64)
+    has_special = passwords.str.contains(_SPECIAL_PATTERN, regex=True).to_numpy(dtype=np.float64)
+    n_unique = passwords.map(lambda p: len(set(p))).to_numpy(dtype=np.float64)
+
+    # Avoid dividing by zero for empty passwords (their ratios stay 0)
+    denom = np.where(length > 0, length, 1)
+    X = np.column_stack([
+        length,
+        n_digit > 0,
+        n_lower > 0,
+        n_upper > 0,
+        has_special,
+        n_digit / denom,
+        n_upper / denom,
+        n_unique / denom,
+    ])
+    return pd.DataFrame(X, columns=FEATURE_NAMES, index=passwords.index)
 
 class PasswordClassifier:
     def __init__(self, model_path='models/password_classifier.joblib'):
         self.model_path = model_path
+        self.onnx_path = os.path.splitext(model_path)[0] + '.onnx'
         self.model = None
+        self.session = None
+        # Per-thread (1, n_features) input row reused across predict() calls
+        self._local = threading.local()
         
         if os.path.exists(model_path):
             try:
-                self.model = joblib.load(model_path)
+                # Memory-map the pickled arrays instead of reading them into private buffers
+                self.model = joblib.load(model_path, mmap_mode='r')
+                # Predictions are single rows; parallel dispatch only adds overhead
+                if hasattr(self.model, 'n_jobs'):
+                    self.model.n_jobs = 1
+                # Models fitted on a DataFrame (such as the shipped forest) record
+                # feature names; predict() passes a bare ndarray row, which would
+                # otherwise warn "X does not have valid feature names" on every call
+                if hasattr(self.model, 'feature_names_in_'):
+                    del self.model.feature_names_in_
                 print(f"✅ Model loaded from {model_path}")
             except Exception as e:
                 print(f"⚠️ Error loading model: {e}")
 
+        if self.model is not None:
+            self._load_onnx_session()
+
+    def _load_onnx_session(self):
+        """Use the exported ONNX model for predictions if it is usable and up to date."""
+        self.session = None
+        if onnxruntime is None or not os.path.exists(self.onnx_path):
+            return
+        if os.path.getmtime(self.onnx_path) < os.path.getmtime(self.model_path):
+            print(f"⚠️ {self.onnx_path} is older than {self.model_path}, ignoring it")
+            return
+        try:
+            self.session = onnxruntime.InferenceSession(self.onnx_path, providers=['CPUExecutionProvider'])
+            self._onnx_input = self.session.get_inputs()[0].name
+            self._onnx_label = self.session.get_outputs()[0].name
+            print(f"⚡ ONNX model loaded from {self.onnx_path}")
+        except Exception as e:
+            self.session = None
+            print(f"⚠️ Error loading ONNX model: {e}")
+
+    def _export_onnx(self):
+        """Export the trained model to ONNX; skipped when skl2onnx is not installed."""
+        try:
+            from skl2onnx import convert_sklearn
+            from skl2onnx.common.data_types import FloatTensorType
+        except ImportError:
+            print("ℹ️ skl2onnx not installed, skipping ONNX export")
+            return
+        try:
+            onx = convert_sklearn(
+                self.model,
+                initial_types=[('input', FloatTensorType([None, len(FEATURE_NAMES)]))],
+                options={type(self.model): {'zipmap': False}},
+            )
+            with open(self.onnx_path, 'wb') as f:
+                f.write(onx.SerializeToString())
+            print(f"💾 ONNX model saved to {self.onnx_path}")
+        except Exception as e:
+            print(f"⚠️ ONNX export failed: {e}")
+
     def model_exists(self):
         return self.model is not None
 
+    def feature_values(self, password):
+        """Features for one password as a tuple, in FEATURE_NAMES order."""
+        classes = password.translate(_CHAR_CLASS_TABLE)
+        n_digit = classes.count(_DIGIT)
+        n_upper = classes.count(_UPPER)
+        n_lower = classes.count(_LOWER)
+        n_special = classes.count(_SPECIAL)
+
+        length = len(password)
+        return (
+            length,
+            int(n_digit > 0),
+            int(n_lower > 0),
+            int(n_upper > 0),
+            int(n_special > 0),
+            n_digit / length if length else 0,
+            n_upper / length if length else 0,
+            len(set(password)) / length if length else 0,
+        )
+
     def extract_features(self, password):
-        return {
-            'length': len(password),
-            'has_digits': int(bool(re.search(r'\d', password))),
-            'has_lowercase': int(bool(re.search(r'[a-z]', password))),
-            'has_uppercase': int(bool(re.search(r'[A-Z]', password))),
-            'has_special': int(bool(re.search(r'[!@#$%^&*(),.?":{}|<>]', password))),
-            'digits_ratio': sum(c.isdigit() for c in password) / len(password) if password else 0,
-            'uppercase_ratio': sum(c.isupper() for c in password) / len(password) if password else 0,
-            'unique_char_ratio': len(set(password)) / len(password) if password else 0,
-        }
-
-    def prepare_data(self, file_path):
+        return dict(zip(FEATURE_NAMES, self.feature_values(password)))
+
+    def extract_features_batch(self, passwords, n_jobs=1, chunk_size=50000):
+        """
+        Vectorized equivalent of extract_features for a Series of passwords.
+        With n_jobs != 1, chunks of chunk_size rows are processed in parallel.
+        """
+        if n_jobs == 1 or len(passwords) <= chunk_size:
+            return _batch_features(passwords)
+        chunks = [passwords.iloc[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+        parts = Parallel(n_jobs=n_jobs)(delayed(_batch_features)(chunk) for chunk in chunks)
+        return pd.concat(parts)
+
+    def prepare_data(self, file_path, n_jobs=-1):
         print(f"📥 Loading dataset from {file_path}...")
-        df = pd.read_csv(file_path)
+        # Typed C-engine read; NA detection is off so passwords such as
+        # "null" or "NaN" stay strings instead of becoming missing values
+        df = pd.read_csv(
+            file_path,
+            engine='c',
+            dtype={'password': str, 'label': 'int8'},
+            keep_default_na=False,
+        )
 
-        X = pd.DataFrame([self.extract_features(p) for p in df['password']])
+        X = self.extract_features_batch(df['password'], n_jobs=n_jobs)
         y = df['label']
 
-        print(f"📊 Dataset size: {len(y)} | Weak: {sum(y)} | Strong: {len(y)-sum(y)}")
+        n_weak = int(y.sum())
+        print(f"📊 Dataset size: {len(y)} | Weak: {n_weak} | Strong: {len(y) - n_weak}")
         return train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
 
-    def train(self, file_path):
-        X_train, X_test, y_train, y_test = self.prepare_data(file_path)
+    def train(self, file_path, n_jobs=-1):
+        X_train, X_test, y_train, y_test = self.prepare_data(file_path, n_jobs=n_jobs)
 
-        print("🌲 Training Random Forest...")
-        self.model = RandomForestClassifier(
-            n_estimators=200,
-            max_depth=None,
+        print("🌲 Training Histogram Gradient Boosting...")
+        # Shallow boosted trees keep single-row inference fast and the model file small
+        self.model = HistGradientBoostingClassifier(
+            max_iter=100,
+            max_depth=8,
+            learning_rate=0.1,
             class_weight='balanced',  # important for balanced datasets
             random_state=42
         )
-        self.model.fit(X_train, y_train)
+        # Fit on plain arrays so predict() can pass an ndarray row directly
+        self.model.fit(X_train.to_numpy(dtype=np.float32), y_train)
 
-        y_pred = self.model.predict(X_test)
+        y_pred = self.model.predict(X_test.to_numpy(dtype=np.float32))
         acc = accuracy_score(y_test, y_pred)
         print(f"✅ Accuracy: {acc:.4f}")
         print(classification_report(y_test, y_pred))
@@ -64,9 +200,21 @@ class PasswordClassifier:
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
         joblib.dump(self.model, self.model_path)
         print(f"💾 Model saved to {self.model_path}")
+        self._export_onnx()
+        self._load_onnx_session()
+
+    def _feature_buffer(self):
+        features = getattr(self._local, 'features', None)
+        if features is None:
+            features = self._local.features = np.empty((1, len(FEATURE_NAMES)), dtype=np.float32)
+        return features
 
     def predict(self, password):
         if not self.model:
             raise RuntimeError("Model not loaded or trained.")
-        features = pd.DataFrame([self.extract_features(password)])
+        features = self._feature_buffer()
+        features[0] = self.feature_values(password)
+        if self.session is not None:
+            label = self.session.run([self._onnx_label], {self._onnx_input: features})[0]
+            return bool(label[0])
         return bool(self.model.predict(features)[0])
@@ -1,19 +1,112 @@
 import math
 import re
+import string
+import sys
+import threading
+from dataclasses import dataclass
+from itertools import islice
 import zxcvbn
-from models.classifier import PasswordClassifier
-
-# Initialize the ML classifier
-try:
-    ml_classifier = PasswordClassifier()
-    ML_MODEL_AVAILABLE = ml_classifier.model_exists()
-    if ML_MODEL_AVAILABLE:
-        print("🤖 ML Model loaded successfully!")
-    else:
-        print("⚠️ ML Model not available, using rule-based scoring only")
-except Exception as e:
-    print(f"⚠️ Error loading ML model: {e}")
-    ML_MODEL_AVAILABLE = False
+from utils.cache import HashedLRUCache
+
+# Precompiled patterns used on every scoring call
+_RE_SEQ_LETTERS = re.compile(r'(abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|mno|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz)')
+_RE_SEQ_DIGITS = re.compile(r'(123|234|345|456|567|678|789|012|987|654|321)')
+
+# Banned terms (especially for Barclays mode), matched in a single regex scan
+BANNED_TERMS = ('barclays', 'bank', 'password', '123', 'admin', 'user', 'login', 'welcome', 'letmein')
+_RE_BANNED = re.compile('|'.join(map(re.escape, BANNED_TERMS)), re.IGNORECASE)
+
+# Exact matches that get an extra penalty
+_WEAK_EXACT = frozenset({'password', 'admin', 'user', 'login', 'welcome', '123456', 'qwerty'})
+
+# Most common leaked passwords; these (and anything shorter than
+# MIN_SCORED_LENGTH) are scored as very weak without running zxcvbn or the model
+MIN_SCORED_LENGTH = 4
+_BUILTIN_TOP_PASSWORDS = (
+    '123456', '12345', '123456789', 'password', 'iloveyou', 'princess', '1234567',
+    'rockyou', '12345678', 'abc123', 'nicole', 'daniel', 'babygirl', 'monkey',
+    'lovely', 'jessica', '654321', 'michael', 'ashley', 'qwerty', '111111',
+    'iloveu', '000000', 'michelle', 'tigger', 'sunshine', 'chocolate', 'password1',
+    'soccer', 'anthony', 'friends', 'butterfly', 'purple', 'angel', 'jordan',
+    'liverpool', 'justin', 'loveme', '123123', 'football', 'secret', 'superman',
+    '1234567890', 'welcome', 'admin', 'login', 'letmein', 'passw0rd', 'trustno1',
+)
+
+def _load_top_passwords(path='data/rockyou.txt', limit=100):
+    """
+    Build the set of top passwords from the head of the RockYou list, if present.
+    
+    Args:
+        path (str): Path to a password list, most common first
+        limit (int): Number of lines to read
+        
+    Returns:
+        frozenset: Lowercased top passwords
+    """
+    top = set(_BUILTIN_TOP_PASSWORDS)
+    try:
+        with open(path, 'r', encoding='latin-1') as f:
+            top.update(line.rstrip('\r\n').lower() for line in islice(f, limit))
+    except OSError:
+        pass
+    top.discard('')
+    return frozenset(top)
+
+_TOP_PASSWORDS = _load_top_passwords()
+
+# The ML classifier is loaded on first use, so importing this module (and
+# serving routes that never score a password) does not pay for loading
+# scikit-learn and the model file.
+_ml_classifier = None
+_ml_tried = False
+_ml_lock = threading.Lock()
+
+def _get_classifier():
+    """
+    Load the ML classifier on first call.
+    
+    Returns:
+        PasswordClassifier or None: The classifier, or None if no model is available
+    """
+    global _ml_classifier, _ml_tried
+    if not _ml_tried:
+        with _ml_lock:
+            if not _ml_tried:
+                try:
+                    from models.classifier import PasswordClassifier
+                    classifier = PasswordClassifier()
+                    if classifier.model_exists():
+                        _ml_classifier = classifier
+                        print("🤖 ML Model loaded successfully!")
+                    else:
+                        print("⚠️ ML Model not available, using rule-based scoring only")
+                except Exception as e:
+                    print(f"⚠️ Error loading ML model: {e}")
+                _ml_tried = True
+    return _ml_classifier
+
+# Per-password memos for zxcvbn and scoring. Keys are salted hashes and the
+# values hold only derived data (zxcvbn's own result embeds the password and
+# its matched tokens), so no plaintext password is kept in memory
+_zxcvbn_cache = HashedLRUCache(maxsize=4096)
+_score_cache = HashedLRUCache(maxsize=4096)
+
+def _zxcvbn_summary(password):
+    """The zxcvbn fields this module uses, without the password itself."""
+    result = zxcvbn.zxcvbn(password)
+    return {
+        'score': result['score'],
+        'guesses_log10': result['guesses_log10'],
+        'crack_times_display': dict(result['crack_times_display']),
+    }
+
+def _zxcvbn_cached(password):
+    """
+    Run zxcvbn once per distinct password; the result is deterministic.
+    
+    Callers must treat the returned dict as read-only since it is shared.
+    """
+    return _zxcvbn_cache.get_or_compute(_zxcvbn_summary, password)
 
 def calculate_entropy(password):
     """
@@ -26,13 +119,37 @@ def calculate_entropy(password):
         float: The calculated entropy in bits
     """
     # Use zxcvbn for a more accurate entropy calculation
-    result = zxcvbn.zxcvbn(password)
+    result = _zxcvbn_cached(password)
     
     # Return the guesses entropy from zxcvbn
     entropy = result['guesses_log10'] * math.log(10, 2)
     
     return round(entropy, 2)
 
+# Character class bits: lowercase, uppercase, digits, and everything else
+_MASK_LOWER, _MASK_UPPER, _MASK_DIGIT, _MASK_SPECIAL = 1, 2, 4, 8
+
+# Charset size for each of the 16 class masks (at least 1); specials
+# approximate the common symbols
+_CHARSET_SIZE = tuple(
+    max((26 if mask & _MASK_LOWER else 0) + (26 if mask & _MASK_UPPER else 0)
+        + (10 if mask & _MASK_DIGIT else 0) + (33 if mask & _MASK_SPECIAL else 0), 1)
+    for mask in range(16)
+)
+
+# Natural log of each charset size, so ln(combinations) is one multiply
+_LOG_CHARSET = tuple(math.log(size) for size in _CHARSET_SIZE)
+_LN10 = math.log(10)
+
+# Maps each ASCII character to a class marker so str.translate + str.count
+# count the classes in C; other ASCII maps to '\x00' and non-ASCII passes
+# through unchanged, so neither can match a marker and both count as special
+_LOWER_MARK, _UPPER_MARK, _DIGIT_MARK = '\x01', '\x02', '\x03'
+_CLASS_TABLE = dict.fromkeys(range(128), '\x00')
+for _chars, _mark in ((string.ascii_lowercase, _LOWER_MARK), (string.ascii_uppercase, _UPPER_MARK),
+                      (string.digits, _DIGIT_MARK)):
+    _CLASS_TABLE.update(dict.fromkeys(map(ord, _chars), _mark))
+
 def calculate_charset_size(password):
     """
     Calculate the size of the character set used in a password.
@@ -43,22 +160,86 @@ def calculate_charset_size(password):
     Returns:
         int: The size of the character set
     """
-    has_lowercase = bool(re.search(r'[a-z]', password))
-    has_uppercase = bool(re.search(r'[A-Z]', password))
-    has_digits = bool(re.search(r'\d', password))
-    has_symbols = bool(re.search(r'[^a-zA-Z0-9]', password))
-    
-    charset_size = 0
-    if has_lowercase:
-        charset_size += 26
-    if has_uppercase:
-        charset_size += 26
-    if has_digits:
-        charset_size += 10
-    if has_symbols:
-        charset_size += 33  # Approximation of common symbols
+    return PasswordFeatures.from_password(password).charset_size
+
+# Combination counts are reported exactly only while they fit a float's
+# 53-bit mantissa (2**53 ~ 10**15.95); above that a float approximation is
+# sent, and past the float range only the log10 value
+_EXACT_COMBINATIONS_LOG10 = 15.9
+_MAX_FLOAT_LOG10 = math.log10(sys.float_info.max) - 0.01
+
+@dataclass(frozen=True)
+class PasswordFeatures:
+    """
+    Character statistics for one password, computed once and shared by the
+    visualization and cracking-time helpers instead of re-scanning the password.
     
-    return max(charset_size, 1)  # Ensure charset size is at least 1
+    Counts use ASCII classes: a-z, A-Z, 0-9, and everything else as special.
+    """
+    length: int
+    charset_size: int
+    lowercase_count: int
+    uppercase_count: int
+    digit_count: int
+    special_count: int
+    log_combinations: float  # ln(charset_size ** length)
+
+    @classmethod
+    def from_password(cls, password):
+        """
+        Build the features, counting character classes with one
+        str.translate and three str.count calls.
+        
+        Args:
+            password (str): The password to analyze
+            
+        Returns:
+            PasswordFeatures: The password's features
+        """
+        classes = password.translate(_CLASS_TABLE)
+        lower = classes.count(_LOWER_MARK)
+        upper = classes.count(_UPPER_MARK)
+        digit = classes.count(_DIGIT_MARK)
+        length = len(password)
+        special = length - lower - upper - digit
+        
+        mask = ((_MASK_LOWER if lower else 0) | (_MASK_UPPER if upper else 0)
+                | (_MASK_DIGIT if digit else 0) | (_MASK_SPECIAL if special else 0))
+        charset_size = _CHARSET_SIZE[mask]
+        return cls(
+            length=length,
+            charset_size=charset_size,
+            lowercase_count=lower,
+            uppercase_count=upper,
+            digit_count=digit,
+            special_count=special,
+            log_combinations=length * _LOG_CHARSET[mask],
+        )
+
+    @property
+    def log10_combinations(self):
+        """log10 of the number of possible combinations."""
+        return self.log_combinations / _LN10
+
+    def combinations(self):
+        """
+        Number of possible combinations, sized for a JSON response.
+        
+        Returns:
+            int | float | None: The exact count while it is below ~2**53, a float
+            approximation above that, or None beyond the float range
+        """
+        log10 = self.log10_combinations
+        if log10 <= _EXACT_COMBINATIONS_LOG10:
+            return self.charset_size ** self.length
+        if log10 <= _MAX_FLOAT_LOG10:
+            return math.exp(self.log_combinations)
+        return None
+
+    @property
+    def char_types(self):
+        """Number of character classes used (0-4)."""
+        return (self.lowercase_count > 0) + (self.uppercase_count > 0) + (self.digit_count > 0) + (self.special_count > 0)
 
 def estimate_cracking_time(password):
     """
@@ -71,7 +252,7 @@ def estimate_cracking_time(password):
         dict: A dictionary containing the cracking time estimates
     """
     # Use zxcvbn for a more accurate estimation
-    result = zxcvbn.zxcvbn(password)
+    result = _zxcvbn_cached(password)
     
     # Extract the crack time information
     crack_times = {
@@ -84,10 +265,51 @@ def estimate_cracking_time(password):
     
     return crack_times
 
+def _common_pattern_penalty(password, lower_pwd, features):
+    """
+    Penalty for weak patterns, shared by the ML and rule-based scoring paths.
+    
+    Args:
+        password (str): The password to evaluate
+        lower_pwd (str): The password lowercased
+        features (PasswordFeatures): Character class counts of the password
+        
+    Returns:
+        int: The penalty to subtract from the score
+    """
+    n_lower, n_upper, n_digit = features.lowercase_count, features.uppercase_count, features.digit_count
+    length = features.length
+    penalty = 0
+    
+    # Check for common weak patterns
+    if length and n_lower == length:  # Only lowercase
+        penalty += 10
+    if length and n_upper == length:  # Only uppercase
+        penalty += 10
+    if length and n_digit == length:  # Only digits
+        penalty += 15
+    if len(set(password)) < length * 0.5:  # Too many repeated characters
+        penalty += 5
+    if lower_pwd in _WEAK_EXACT:
+        penalty += 20
+    
+    # Check for sequential patterns
+    if _RE_SEQ_LETTERS.search(lower_pwd):
+        penalty += 10
+    if _RE_SEQ_DIGITS.search(password):
+        penalty += 10
+    
+    # SEVERE PENALTY for banned terms (especially for Barclays mode)
+    if _RE_BANNED.search(password):
+        penalty += 50  # Severe penalty for banned terms
+    
+    return penalty
+
 def get_strength_score(password):
     """
     Get a strength score for a password from 0 to 100.
     Uses trained ML model when available, falls back to rule-based scoring.
+    Scores are memoized per password under salted-hash keys.
     
     Args:
         password (str): The password to evaluate
@@ -95,8 +317,24 @@ def get_strength_score(password):
     Returns:
         int: A score from 0 to 100, where 0 is very weak and 100 is very strong
     """
+    return _score_cache.get_or_compute(_strength_score, password)
+
+def _strength_score(password):
+    """Uncached body of get_strength_score."""
+    lower_pwd = password.lower()
+    
+    # Fast path: trivially short or top-listed passwords are very weak
+    if len(password) < MIN_SCORED_LENGTH or lower_pwd in _TOP_PASSWORDS:
+        return 0
+    
+    features = PasswordFeatures.from_password(password)
+    n_lower, n_upper = features.lowercase_count, features.uppercase_count
+    n_digit, n_symbol = features.digit_count, features.special_count
+    complexity = features.char_types
+    
     # Try to use ML model first if available
-    if ML_MODEL_AVAILABLE and ml_classifier:
+    ml_classifier = _get_classifier()
+    if ml_classifier:
         try:
             # Get ML prediction (True = strong, False = weak)
             ml_prediction = ml_classifier.predict(password)
@@ -105,57 +343,28 @@ def get_strength_score(password):
             if ml_prediction:
                 # ML says strong - give score between 60-100
                 base_score = 60 + (len(password) * 2)  # Length bonus
-                complexity_bonus = sum([
-                    bool(re.search(r'[a-z]', password)),
-                    bool(re.search(r'[A-Z]', password)),
-                    bool(re.search(r'\d', password)),
-                    bool(re.search(r'[^a-zA-Z0-9]', password))
-                ]) * 5
+                complexity_bonus = complexity * 5
                 ml_score = min(100, base_score + complexity_bonus)
             else:
                 # ML says weak - give score between 0-40
                 ml_score = max(0, 20 - len(password))
             
             # Apply rule-based penalties for specific patterns
-            penalty = 0
-            
-            # Check for common weak patterns
-            if re.search(r'^[a-z]+$', password):  # Only lowercase
-                penalty += 10
-            if re.search(r'^[A-Z]+$', password):  # Only uppercase
-                penalty += 10
-            if re.search(r'^\d+$', password):  # Only digits
-                penalty += 15
-            if len(set(password)) < len(password) * 0.5:  # Too many repeated characters
-                penalty += 5
-            if password.lower() in ['password', 'admin', 'user', 'login', 'welcome', '123456', 'qwerty']:
-                penalty += 20
-            
-            # Check for sequential patterns
-            if re.search(r'(abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|mno|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz)', password.lower()):
-                penalty += 10
-            if re.search(r'(123|234|345|456|567|678|789|012|987|654|321)', password):
-                penalty += 10
-            
-            # SEVERE PENALTY for banned terms (especially for Barclays mode)
-            banned_terms = ['barclays', 'bank', 'password', '123', 'admin', 'user', 'login', 'welcome', 'letmein']
-            for term in banned_terms:
-                if term.lower() in password.lower():
-                    penalty += 50  # Severe penalty for banned terms
-                    break
+            penalty = _common_pattern_penalty(password, lower_pwd, features)
             
             # Additional penalties for weak patterns
             if len(password) < 8:  # Too short
                 penalty += 15
-            if not re.search(r'[a-z]', password) and not re.search(r'[A-Z]', password):  # No letters
+            if not n_lower and not n_upper:  # No letters
                 penalty += 20
-            if not re.search(r'\d', password):  # No digits
+            if not n_digit:  # No digits
                 penalty += 10
-            if not re.search(r'[^a-zA-Z0-9]', password):  # No special characters
+            if not n_symbol:  # No special characters
                 penalty += 5
             
             # Specific penalty for only uppercase letters (common weak pattern)
-            if re.search(r'^[A-Z]+\d*$', password):  # Only uppercase + optional digits
+            head = password.rstrip('0123456789')
+            if head and n_upper == len(head):  # Only uppercase + optional digits
                 penalty += 30  # Heavy penalty for this pattern
             
             final_score = max(0, min(100, ml_score - penalty))
@@ -166,7 +375,7 @@ def get_strength_score(password):
     
     # Fallback to rule-based scoring (original logic)
     # Use zxcvbn for scoring
-    result = zxcvbn.zxcvbn(password)
+    result = _zxcvbn_cached(password)
     
     # Convert zxcvbn score (0-4) to a 0-100 scale
     base_score = result['score'] * 20  # Reduced from 25 to 20
@@ -186,41 +395,10 @@ def get_strength_score(password):
         bonus += 2  # Reduced from 5 to 2
     
     # Complexity bonus (reduced)
-    complexity = sum([
-        bool(re.search(r'[a-z]', password)),
-        bool(re.search(r'[A-Z]', password)),
-        bool(re.search(r'\d', password)),
-        bool(re.search(r'[^a-zA-Z0-9]', password))
-    ])
     bonus += complexity * 1.5  # Reduced from 2.5 to 1.5
     
     # Penalty for common patterns
-    penalty = 0
-    
-    # Check for common weak patterns
-    if re.search(r'^[a-z]+$', password):  # Only lowercase
-        penalty += 10
-    if re.search(r'^[A-Z]+$', password):  # Only uppercase
-        penalty += 10
-    if re.search(r'^\d+$', password):  # Only digits
-        penalty += 15
-    if len(set(password)) < len(password) * 0.5:  # Too many repeated characters
-        penalty += 5
-    if password.lower() in ['password', 'admin', 'user', 'login', 'welcome', '123456', 'qwerty']:
-        penalty += 20
-    
-    # Check for sequential patterns
-    if re.search(r'(abc|bcd|cde|def|efg|fgh|ghi|hij|ijk|jkl|klm|lmn|mno|nop|opq|pqr|qrs|rst|stu|tuv|uvw|vwx|wxy|xyz)', password.lower()):
-        penalty += 10
-    if re.search(r'(123|234|345|456|567|678|789|012|987|654|321)', password):
-        penalty += 10
-    
-    # SEVERE PENALTY for banned terms (especially for Barclays mode)
-    banned_terms = ['barclays', 'bank', 'password', '123', 'admin', 'user', 'login', 'welcome', 'letmein']
-    for term in banned_terms:
-        if term.lower() in password.lower():
-            penalty += 50  # Severe penalty for banned terms
-            break
+    penalty = _common_pattern_penalty(password, lower_pwd, features)
     
     final_score = max(0, min(100, base_score + bonus - penalty))
     return final_score 
\ No newline at end of file
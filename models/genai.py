@@ -1,18 +1,48 @@
 import os
 import re
-import random
+import secrets
 import string
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Shared HTTP session so OpenAI calls reuse pooled keep-alive connections
+# instead of doing a new TCP + TLS handshake per request
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 # Constants for password generation
 LOWERCASE = string.ascii_lowercase
 UPPERCASE = string.ascii_uppercase
 DIGITS = string.digits
 SPECIAL = "!@#$%^&*()-_=+[]{}|;:,.<>?"
+_POOL = LOWERCASE + UPPERCASE + DIGITS + SPECIAL
+
+# Suggested passwords may actually be used, so draw them from the OS CSPRNG
+# rather than the predictable Mersenne Twister behind the random module
+_SYSRAND = secrets.SystemRandom()
+
+# Precompiled patterns for password analysis
+_RE_LOWER = re.compile(r'[a-z]')
+_RE_UPPER = re.compile(r'[A-Z]')
+_RE_DIGIT = re.compile(r'\d')
+_RE_SYMBOL = re.compile(r'[^a-zA-Z0-9]')
+_RE_REPEATED = re.compile(r'(.)\1{2,}')
+_RE_YEAR = re.compile(r'19\d{2}|20\d{2}')
+
+# Multi-term matchers built once: one regex scan instead of a loop of `in` checks
+KEYBOARD_SEQUENCES = ("qwerty", "asdfgh", "zxcvbn", "qwertyuiop", "asdfghjkl", "zxcvbnm")
+NUM_SEQUENCES = ("123", "456", "789", "012", "987", "654", "321")
+COMMON_WORDS = ("password", "admin", "user", "login", "welcome", "letmein", "secret")
+_RE_KEYBOARD = re.compile('|'.join(map(re.escape, KEYBOARD_SEQUENCES)))
+_RE_NUM_SEQUENCE = re.compile('|'.join(map(re.escape, NUM_SEQUENCES)))
+_RE_COMMON_WORD = re.compile('|'.join(map(re.escape, COMMON_WORDS)))
+
+# Deletes ASCII letters and digits; what remains are the special characters
+_DELETE_ALNUM = str.maketrans('', '', string.ascii_letters + string.digits)
 
 def get_openai_suggestion(password, security_level=3):
     """
@@ -35,10 +65,10 @@ def get_openai_suggestion(password, security_level=3):
     # Sanitize password for API call (don't send actual password)
     sanitized_info = {
         "length": len(password),
-        "has_lowercase": bool(re.search(r'[a-z]', password)),
-        "has_uppercase": bool(re.search(r'[A-Z]', password)),
-        "has_digits": bool(re.search(r'\d', password)),
-        "has_special": bool(re.search(r'[^a-zA-Z0-9]', password)),
+        "has_lowercase": bool(_RE_LOWER.search(password)),
+        "has_uppercase": bool(_RE_UPPER.search(password)),
+        "has_digits": bool(_RE_DIGIT.search(password)),
+        "has_special": bool(_RE_SYMBOL.search(password)),
         "patterns": detect_patterns(password),
         "security_level": security_level
     }
@@ -69,7 +99,7 @@ def get_openai_suggestion(password, security_level=3):
             "max_tokens": 300
         }
         
-        response = requests.post(
+        response = _SESSION.post(
             "https://api.openai.com/v1/chat/completions",
             headers=headers,
             json=payload
@@ -134,26 +164,26 @@ def get_fallback_suggestions(password, security_level=3):
         improvements.append(f"Use at least {min_length} characters")
     
     # Check character types
-    if not re.search(r'[a-z]', password):
+    if not _RE_LOWER.search(password):
         weaknesses.append("Missing lowercase letters")
         improvements.append("Add lowercase letters")
     
-    if not re.search(r'[A-Z]', password):
+    if not _RE_UPPER.search(password):
         weaknesses.append("Missing uppercase letters")
         improvements.append("Add uppercase letters")
     
-    if not re.search(r'\d', password):
+    if not _RE_DIGIT.search(password):
         weaknesses.append("Missing numbers")
         improvements.append("Add numeric digits")
     
     # Special characters (required for level 2+)
-    if security_level >= 2 and not re.search(r'[^a-zA-Z0-9]', password):
+    if security_level >= 2 and not _RE_SYMBOL.search(password):
         weaknesses.append("Missing special characters (required for this security level)")
         improvements.append("Add special characters like !@#$%^&*")
     
     # Number of special characters (for higher levels)
     if security_level >= 4:
-        special_count = sum(1 for c in password if not c.isalnum())
+        special_count = len(password.translate(_DELETE_ALNUM))
         if special_count < 2:
             weaknesses.append("Not enough special characters for high security level")
             improvements.append("Use at least 2 special characters")
@@ -189,32 +219,23 @@ def detect_patterns(password):
     lower_pwd = password.lower()
     
     # Check for keyboard sequences
-    keyboard_sequences = ["qwerty", "asdfgh", "zxcvbn", "qwertyuiop", "asdfghjkl", "zxcvbnm"]
-    for seq in keyboard_sequences:
-        if seq in lower_pwd:
-            patterns.append("keyboard sequence")
-            break
+    if _RE_KEYBOARD.search(lower_pwd):
+        patterns.append("keyboard sequence")
     
     # Check for numerical sequences
-    num_sequences = ["123", "456", "789", "012", "987", "654", "321"]
-    for seq in num_sequences:
-        if seq in password:
-            patterns.append("numerical sequence")
-            break
+    if _RE_NUM_SEQUENCE.search(password):
+        patterns.append("numerical sequence")
     
     # Check for repeated characters
-    if re.search(r'(.)\1{2,}', password):  # Same character repeated 3+ times
+    if _RE_REPEATED.search(password):  # Same character repeated 3+ times
         patterns.append("repeated characters")
     
     # Check for common words
-    common_words = ["password", "admin", "user", "login", "welcome", "letmein", "secret"]
-    for word in common_words:
-        if word in lower_pwd:
-            patterns.append("common word")
-            break
+    if _RE_COMMON_WORD.search(lower_pwd):
+        patterns.append("common word")
     
     # Check for years
-    if re.search(r'19\d{2}|20\d{2}', password):
+    if _RE_YEAR.search(password):
         patterns.append("year pattern")
     
     return patterns
@@ -233,45 +254,38 @@ def generate_alternative_passwords(original_password, security_level=3, count=3)
     """
     alternatives = []
     
+    # Adjust password characteristics based on security level
+    length = 8 + (security_level * 2)  # 10-18 characters
+    
+    # Character type requirements
+    min_lowercase = max(1, length // 5)
+    min_uppercase = max(1, length // 5)
+    min_digits = max(1, length // 5)
+    
+    # Special chars based on security level
+    min_special = 0
+    if security_level >= 2:
+        min_special = 1
+    if security_level >= 4:
+        min_special = 2
+    
+    minimums = ((LOWERCASE, min_lowercase), (UPPERCASE, min_uppercase),
+                (DIGITS, min_digits), (SPECIAL, min_special))
+    
+    choices, shuffle = _SYSRAND.choices, _SYSRAND.shuffle
+    
     for _ in range(count):
-        # Adjust password characteristics based on security level
-        length = 8 + (security_level * 2)  # 10-18 characters
-        
-        # Character type requirements
-        min_lowercase = max(1, length // 5)
-        min_uppercase = max(1, length // 5)
-        min_digits = max(1, length // 5)
-        
-        # Special chars based on security level
-        min_special = 0
-        if security_level >= 2:
-            min_special = 1
-        if security_level >= 4:
-            min_special = 2
-        
-        remaining = length - (min_lowercase + min_uppercase + min_digits + min_special)
-        
-        # Distribute remaining characters randomly
-        add_lowercase = random.randint(0, remaining)
-        remaining -= add_lowercase
-        
-        add_uppercase = random.randint(0, remaining)
-        remaining -= add_uppercase
-        
-        add_digits = random.randint(0, remaining)
-        remaining -= add_digits
-        
-        add_special = remaining
+        # Draw every position from the full pool in one call
+        chars = choices(_POOL, k=length)
         
-        # Generate the characters
-        chars = []
-        chars.extend(random.choices(LOWERCASE, k=min_lowercase + add_lowercase))
-        chars.extend(random.choices(UPPERCASE, k=min_uppercase + add_uppercase))
-        chars.extend(random.choices(DIGITS, k=min_digits + add_digits))
-        chars.extend(random.choices(SPECIAL, k=min_special + add_special))
+        # Guarantee the per-type minimums by overwriting leading positions
+        pos = 0
+        for charset, minimum in minimums:
+            chars[pos:pos + minimum] = choices(charset, k=minimum)
+            pos += minimum
         
         # Shuffle the characters
-        random.shuffle(chars)
+        shuffle(chars)
         
         # Create the password
         alternative = ''.join(chars)
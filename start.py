@@ -9,27 +9,33 @@ import os
 import subprocess
 import importlib.util
 
+# Import name -> pip package name, for packages whose names differ
+REQUIRED_PACKAGES = {
+    'flask': 'flask',
+    'flask_cors': 'flask-cors',
+    'sklearn': 'scikit-learn',
+    'numpy': 'numpy',
+    'pandas': 'pandas',
+    'openai': 'openai',
+    'zxcvbn': 'zxcvbn',
+    'matplotlib': 'matplotlib',
+    'cryptography': 'cryptography',
+    'requests': 'requests'
+}
+
+# run_server only uses gunicorn + gevent outside Windows, so only require them there
+if os.name != "nt":
+    REQUIRED_PACKAGES.update({'gunicorn': 'gunicorn', 'gevent': 'gevent'})
+
 def check_dependencies():
     """Check if all required dependencies are installed"""
-    required_packages = [
-        'flask',
-        'flask_cors',
-        'scikit-learn',
-        'numpy',
-        'pandas',
-        'openai',
-        'zxcvbn',
-        'matplotlib',
-        'cryptography',
-        'requests'
+    # find_spec only locates each package without importing it, so heavy
+    # packages the server may never use are not loaded here
+    missing_packages = [
+        pip_name for module_name, pip_name in REQUIRED_PACKAGES.items()
+        if importlib.util.find_spec(module_name) is None
     ]
     
-    missing_packages = []
-    
-    for package in required_packages:
-        if importlib.util.find_spec(package) is None:
-            missing_packages.append(package)
-    
     if missing_packages:
         print("❌ Missing dependencies:")
         for package in missing_packages:
@@ -54,11 +60,12 @@ def check_data_files():
         "models/password_classifier.joblib"
     ]
     
-    missing_files = []
-    
-    for file_path in required_files:
-        if not os.path.exists(file_path):
-            missing_files.append(file_path)
+    # stat() each path once and reuse the result below
+    existing = {
+        path for path in required_files + ["data/strong_passwords.txt"]
+        if os.path.exists(path)
+    }
+    missing_files = [path for path in required_files if path not in existing]
     
     if missing_files:
         print("⚠️ Missing data files:")
@@ -68,22 +75,49 @@ def check_data_files():
         print("\nGenerating missing data files...")
         
         # Generate strong passwords if missing
-        if not os.path.exists("data/strong_passwords.txt"):
+        if "data/strong_passwords.txt" not in existing:
             print("Generating strong passwords...")
             subprocess.run([sys.executable, "strong_generated_password.py"])
         
         # Generate balanced dataset if missing
-        if not os.path.exists("data/balanced_passwords.csv"):
+        if "data/balanced_passwords.csv" not in existing:
             print("Generating balanced dataset...")
             subprocess.run([sys.executable, "balanced_password.py"])
         
         # Train model if missing
-        if not os.path.exists("models/password_classifier.joblib"):
+        if "models/password_classifier.joblib" not in existing:
             print("Training password classifier...")
             subprocess.run([sys.executable, "train_model.py"])
     
     return True
 
+def run_server():
+    """
+    Serve the app with gunicorn + gevent workers when available, so slow
+    hashcat/OpenAI calls don't block other requests. DEV=1 runs the Flask
+    debug server instead; without gunicorn (e.g. on Windows) the threaded
+    Flask server is used without debug mode.
+    """
+    use_gunicorn = os.name != "nt" and importlib.util.find_spec("gunicorn") is not None
+    if not os.environ.get("DEV") and use_gunicorn:
+        worker_class = "gevent" if importlib.util.find_spec("gevent") is not None else "gthread"
+        workers = str(min(os.cpu_count() or 1, 4))
+        print(f"🦄 Serving with gunicorn ({workers} {worker_class} workers)")
+        subprocess.run([
+            sys.executable, "-m", "gunicorn",
+            "-k", worker_class,
+            "-w", workers,
+            "--worker-connections", "200",
+            "-b", "0.0.0.0:5000",
+            "app:app",
+        ], check=True)
+        return
+    
+    # Import the Flask app (and its dependency graph) only once checks have passed
+    from app import app
+    debug = bool(os.environ.get("DEV"))
+    app.run(debug=debug, threaded=True, host="0.0.0.0", port=5000)
+
 def main():
     """Main startup function"""
     print("🚀 Starting Password Generator Application")
@@ -110,8 +144,7 @@ def main():
     
     # Start the Flask application
     try:
-        from app import app
-        app.run(debug=True, host="0.0.0.0", port=5000)
+        run_server()
     except KeyboardInterrupt:
         print("\n👋 Application stopped by user")
     except Exception as e:
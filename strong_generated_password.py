@@ -1,10 +1,16 @@
-import random
-import string
+import numpy as np
+import pandas as pd
 
 def generate_human_like_strong_passwords(n=100000):
     """
     Generates a list of human-like but strong passwords.
     Combines words, numbers, and symbols in random patterns.
+    All random choices are drawn up front as NumPy arrays; the loop
+    only assembles strings. The composition columns are derived from
+    those same arrays rather than by re-scanning the passwords.
+    
+    Returns:
+        pandas.DataFrame: Columns password, length, digit_count, special_count, has_upper
     """
     words = [
         "summer", "winter", "london", "secure", "happy",
@@ -13,52 +19,73 @@ def generate_human_like_strong_passwords(n=100000):
         "cyber", "storm", "matrix", "galaxy", "nova"
     ]
     specials = "!@#$%^&*()_+-=<>?"
+    words_cap = [w.capitalize() for w in words]
 
-    strong_passwords = []
+    rng = np.random.default_rng()
 
-    for _ in range(n):
-        # Pick 2 distinct words
-        word1 = random.choice(words)
-        word2 = random.choice(words)
-        while word2 == word1:
-            word2 = random.choice(words)
+    # Pick 2 distinct words: draw the second from the remaining n-1 and
+    # shift it past the first, so no rejection loop is needed
+    w1 = rng.integers(0, len(words), n)
+    w2 = rng.integers(0, len(words) - 1, n)
+    w2 += w2 >= w1
 
-        # Random capitalization
-        if random.random() > 0.3:
-            word1 = word1.capitalize()
-        if random.random() > 0.3:
-            word2 = word2.capitalize()
+    # Random capitalization, number (3–4 digits), special chars and pattern
+    caps = rng.random((n, 2)) > 0.3
+    nums = rng.integers(100, 10000, n)
+    sp = rng.integers(0, len(specials), (n, 2))
+    pat = rng.integers(0, 4, n)
 
-        # Random number (3–4 digits)
-        number = str(random.randint(100, 9999))
+    # Every pattern uses both words, the 3–4 digit number and both specials,
+    # so the composition follows directly from the draws
+    word_lens = np.array([len(w) for w in words])
+    digit_counts = np.where(nums >= 1000, 4, 3)
+    lengths = word_lens[w1] + word_lens[w2] + digit_counts + 2
+    has_upper = caps.any(axis=1)
 
-        # Random special chars
-        special1 = random.choice(specials)
-        special2 = random.choice(specials)
+    # Convert to Python lists once so the loop avoids NumPy scalar overhead
+    w1, w2, nums, pat = w1.tolist(), w2.tolist(), nums.tolist(), pat.tolist()
+    caps, sp = caps.tolist(), sp.tolist()
 
-        # Random pattern
-        patterns = [
-            f"{word1}{special1}{number}{word2}{special2}",
-            f"{special1}{word1}{number}{special2}{word2}",
-            f"{word1}{number}{special1}{word2}{special2}",
-            f"{word1}{special1}{word2}{number}{special2}"
-        ]
-        password = random.choice(patterns)
+    strong_passwords = []
 
-        # Ensure length ≥ 12
-        if len(password) < 12:
-            extra_chars = ''.join(random.choices(string.ascii_letters + string.digits + specials, k=12 - len(password)))
-            password += extra_chars
+    for i in range(n):
+        word1 = words_cap[w1[i]] if caps[i][0] else words[w1[i]]
+        word2 = words_cap[w2[i]] if caps[i][1] else words[w2[i]]
+        number = nums[i]
+        special1 = specials[sp[i][0]]
+        special2 = specials[sp[i][1]]
 
+        # Random pattern
+        p = pat[i]
+        if p == 0:
+            password = f"{word1}{special1}{number}{word2}{special2}"
+        elif p == 1:
+            password = f"{special1}{word1}{number}{special2}{word2}"
+        elif p == 2:
+            password = f"{word1}{number}{special1}{word2}{special2}"
+        else:
+            password = f"{word1}{special1}{word2}{number}{special2}"
+
+        # No padding to 12 characters is needed: the two shortest distinct
+        # words plus 3 digits and 2 specials already make 14 characters
         strong_passwords.append(password)
 
-    return strong_passwords
+    return pd.DataFrame({
+        "password": strong_passwords,
+        "length": lengths,
+        "digit_count": digit_counts,
+        "special_count": np.full(n, 2),
+        "has_upper": has_upper,
+    })
 
 
 # Save to file
-strong_passwords = generate_human_like_strong_passwords()
-with open('data/strong_passwords.txt', 'w', encoding='utf-8') as f:
-    for pwd in strong_passwords:
-        f.write(pwd + '\n')
+strong_df = generate_human_like_strong_passwords()
+# Every character is ASCII, so encode and write the whole file as one bytes block
+with open('data/strong_passwords.txt', 'wb') as f:
+    f.write('\n'.join(strong_df["password"]).encode('ascii') + b'\n')
+
+# Same passwords with their composition columns, ready for read_csv
+strong_df.to_csv('data/strong_passwords.csv', index=False)
 
-print("✅ 100,000 human-like strong passwords generated and saved to data/strong_passwords.txt")
+print("✅ 100,000 human-like strong passwords generated and saved to data/strong_passwords.txt and data/strong_passwords.csv")
@@ -0,0 +1,90 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+class HashedLRUCache:
+    """
+    Size-bounded, thread-safe LRU cache for per-password results.
+
+    Passwords are never stored as keys: each key is a BLAKE2b digest keyed
+    with a random per-process salt, so cache entries cannot be matched
+    against a password list outside this process.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._salt = os.urandom(16)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, func, password, args):
+        digest = hashlib.blake2b(key=self._salt, digest_size=16)
+        digest.update(password.encode("utf-8", "surrogatepass"))
+        digest.update(repr((func.__qualname__, args)).encode("utf-8"))
+        return digest.digest()
+
+    def lookup(self, func, password, *args):
+        """
+        Look up a cached func(password, *args) result without computing it.
+        
+        Args:
+            func (callable): Function the result belongs to
+            password (str): The password the result is derived from
+            *args: Extra arguments, also part of the cache key
+        
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss
+        """
+        return self._get(self._key(func, password, args))
+
+    def store(self, value, func, password, *args):
+        """
+        Cache value as the result of func(password, *args).
+        
+        Args:
+            value: The result to cache (shared, treat as read-only)
+            func (callable): Function the result belongs to
+            password (str): The password the result is derived from
+            *args: Extra arguments, also part of the cache key
+        """
+        self._put(self._key(func, password, args), value)
+
+    def _get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return True, self._entries[key]
+        return False, None
+
+    def _put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, func, password, *args):
+        """
+        Return func(password, *args), computing it only on a cache miss.
+
+        Args:
+            func (callable): Function to call on a miss
+            password (str): The password the result is derived from
+            *args: Extra arguments, also part of the cache key
+
+        Returns:
+            The cached or freshly computed result (shared, treat as read-only)
+        """
+        key = self._key(func, password, args)
+        hit, value = self._get(key)
+        if hit:
+            return value
+
+        value = func(password, *args)
+        self._put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,36 +1,110 @@
 import os
 import re
+import sys
 import subprocess
 import math
 import tempfile
 import random
+import bisect
+import hashlib
+import threading
 from datetime import datetime
-from models.entropy import calculate_charset_size
+from functools import lru_cache, partial
+from models.entropy import PasswordFeatures
+from utils.cache import HashedLRUCache
 
-def simulate_cracking(password):
+# MD5 is only used to give hashcat a demo target; flag it as non-security
+# use so FIPS-mode OpenSSL builds allow it (the keyword exists on 3.9+)
+if sys.version_info >= (3, 9):
+    _md5 = partial(hashlib.md5, usedforsecurity=False)
+else:
+    _md5 = hashlib.md5
+
+# Hash rate reported in hashcat's status output
+_RE_HASHCAT_SPEED = re.compile(r"(\d+\.?\d*)\s*H/s")
+
+# format_time units: _THRESHOLDS[i - 1] <= seconds < _THRESHOLDS[i] uses _LABELS[i]
+_THRESHOLDS = (1, 60, 3600, 86400, 2592000, 31536000)
+_DIVISORS = (1, 1, 60, 3600, 86400, 2592000, 31536000)
+_LABELS = ("less than a second", "seconds", "minutes", "hours", "days", "months", "years")
+
+# get_password_complexity levels: the length sets a level, capped by how
+# many character types are used (indexed by the number of types, 0-4)
+_COMPLEXITY_LEVELS = ("very_weak", "weak", "medium", "strong", "very_strong")
+_COMPLEXITY_LENGTHS = (6, 8, 10, 12)
+_TYPE_CAP = (1, 1, 2, 3, 4)
+
+# Largest ln(seconds) passed to math.exp; anything beyond is "years" anyway
+_MAX_LOG_SECONDS = 700.0
+
+# Keep the throwaway hash file in RAM when a tmpfs is available
+_HASH_FILE_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Each hashcat run holds a worker for up to 15 seconds and saturates the
+# GPU/CPU, so only a few run at once; requests beyond that get the estimate
+HASHCAT_MAX_CONCURRENT = max(int(os.environ.get("HASHCAT_MAX_CONCURRENT", "2")), 1)
+_hashcat_slots = threading.BoundedSemaphore(HASHCAT_MAX_CONCURRENT)
+
+# Estimates per password (salted-hash keys, see HashedLRUCache), used when
+# hashcat is not installed so a resubmitted password skips the estimation
+_simulation_cache = HashedLRUCache(maxsize=1024)
+
+def simulate_cracking(password, features=None):
     """
     Simulate cracking of a password with or without hashcat.
+    Estimates made while hashcat is not installed are memoized per
+    password (bounded LRU); hashcat runs are never cached.
     
     Args:
         password (str): The password to simulate cracking
+        features (PasswordFeatures, optional): Precomputed features of the password
         
     Returns:
         dict: The results of the simulation
     """
-    # Try to use hashcat if it's available
-    if is_hashcat_available():
+    hit, result = _simulation_cache.lookup(simulate_cracking, password)
+    if hit:
+        return result
+    
+    if features is None:
+        features = PasswordFeatures.from_password(password)
+    result, cacheable = _run_simulation(password, features)
+    if cacheable:
+        _simulation_cache.store(result, simulate_cracking, password)
+    return result
+
+def _run_simulation(password, features):
+    """
+    Uncached body of simulate_cracking.
+    
+    Returns:
+        tuple: (result, cacheable). Only the estimate made because hashcat
+        is not installed is a pure function of the password and cacheable.
+        Every hashcat result (measured speed, 10-second runtime limit,
+        timeouts, errors) depends on load and the hardware shared with
+        other runs, as does the estimate used while all slots are busy.
+    """
+    if not is_hashcat_available():
+        return estimate_cracking_simulation(features), True
+    
+    # Use hashcat if a run slot is free; never queue behind other requests' runs
+    if _hashcat_slots.acquire(blocking=False):
         try:
-            return hashcat_simulation(password)
+            return hashcat_simulation(password, features), False
         except Exception as e:
             print(f"Hashcat simulation failed: {e}")
             # Fall back to estimated simulation
+        finally:
+            _hashcat_slots.release()
     
     # Fallback to estimate simulation
-    return estimate_cracking_simulation(password)
+    return estimate_cracking_simulation(features), False
 
+@lru_cache(maxsize=1)
 def is_hashcat_available():
     """
     Check if hashcat is available on the system.
+    The result is cached, so `hashcat --version` runs once per process.
     
     Returns:
         bool: True if hashcat is available, False otherwise
@@ -46,21 +120,21 @@ def is_hashcat_available():
     except (subprocess.SubprocessError, FileNotFoundError):
         return False
 
-def hashcat_simulation(password):
+def hashcat_simulation(password, features):
     """
     Simulate cracking a password using hashcat.
     
     Args:
         password (str): The password to simulate cracking
+        features (PasswordFeatures): Precomputed features of the password
         
     Returns:
         dict: The results of the simulation
     """
     # Create a temporary file for the hash
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as hash_file:
+    with tempfile.NamedTemporaryFile(mode='w+', delete=False, dir=_HASH_FILE_DIR) as hash_file:
         # Use MD5 for quick simulation (not secure, but good for demo)
-        from hashlib import md5
-        hash_str = md5(password.encode()).hexdigest()
+        hash_str = _md5(password.encode('utf-8', 'surrogatepass')).hexdigest()
         hash_file.write(hash_str)
         hash_file_path = hash_file.name
     
@@ -84,30 +158,33 @@ def hashcat_simulation(password):
             text=True
         )
         
-        # Parse the output
-        if result.returncode == 0 and "Recovered" in result.stdout:
+        # Parse the output; with --quiet a cracked hash is printed as
+        # "<hash>:<plaintext>" instead of a "Recovered" status line
+        cracked = "Recovered" in result.stdout or f"{hash_str}:" in result.stdout
+        if result.returncode == 0 and cracked:
             # Password was cracked
-            speed_match = re.search(r"(\d+\.?\d*)\s*H/s", result.stdout)
+            speed_match = _RE_HASHCAT_SPEED.search(result.stdout)
             speed = float(speed_match.group(1)) if speed_match else 1000
             
             # Calculate the estimated time based on the speed
-            possible_combinations = estimate_combinations(password)
-            estimated_seconds = possible_combinations / (speed * 2)  # Average case is half the keyspace
+            possible_combinations = estimate_combinations(features)
+            log_seconds = features.log_combinations - math.log(speed * 2)  # Average case is half the keyspace
             
             return {
                 "method": "hashcat",
                 "speed": f"{speed} H/s",
-                "estimated_time": format_time(estimated_seconds),
+                "estimated_time": format_log_time(log_seconds),
                 "possible_combinations": possible_combinations,
+                "possible_combinations_log10": round(features.log10_combinations, 2),
                 "was_cracked": True,
                 "time_taken": "10 seconds (limited for demo)"
             }
         else:
-            # If hashcat couldn't crack it in the time limit
+            # If hashcat couldn't crack it in the time limit. The raw output is
+            # not returned: it can contain the cracked plaintext
             return {
                 "method": "hashcat",
                 "result": "Password not cracked in the time limit",
-                "hashcat_output": result.stdout,
                 "was_cracked": False
             }
     
@@ -128,12 +205,12 @@ def hashcat_simulation(password):
         if os.path.exists(hash_file_path):
             os.unlink(hash_file_path)
 
-def estimate_cracking_simulation(password):
+def estimate_cracking_simulation(features):
     """
     Estimate cracking time without using hashcat.
     
     Args:
-        password (str): The password to analyze
+        features (PasswordFeatures): Features of the password to analyze
         
     Returns:
         dict: The results of the estimation
@@ -147,51 +224,48 @@ def estimate_cracking_simulation(password):
         "specialized_hardware": 100000000000000  # Attempts per second (e.g., custom ASIC)
     }
     
-    # Calculate the number of possible combinations
-    possible_combinations = estimate_combinations(password)
+    # Calculate the number of possible combinations; the time estimates work
+    # on its logarithm so no huge number is divided
+    possible_combinations = estimate_combinations(features)
     
     # Calculate time estimates
     time_estimates = {}
     for scenario, speed in SPEEDS.items():
-        time_sec = possible_combinations / (speed * 2)  # Average case is half the keyspace
-        time_estimates[scenario] = format_time(time_sec)
+        log_seconds = features.log_combinations - math.log(speed * 2)  # Average case is half the keyspace
+        time_estimates[scenario] = format_log_time(log_seconds)
     
     # Estimate the time to crack with a simplified dictionary+rules approach
-    dictionary_estimate = estimate_dictionary_time(password)
+    dictionary_estimate = estimate_dictionary_time(features)
     
     return {
         "method": "estimation",
-        "complexity": get_complexity_description(password),
+        "complexity": get_complexity_description(features),
         "possible_combinations": possible_combinations,
+        "possible_combinations_log10": round(features.log10_combinations, 2),
         "estimated_time": time_estimates,
         "dictionary_approach": dictionary_estimate,
-        "charset_size": calculate_charset_size(password)
+        "charset_size": features.charset_size
     }
 
-def estimate_combinations(password):
+def estimate_combinations(features):
     """
     Estimate the number of possible combinations for a password.
+    Large counts are approximated rather than sent as huge integers.
     
     Args:
-        password (str): The password to analyze
+        features (PasswordFeatures): Features of the password to analyze
         
     Returns:
-        int: The estimated number of combinations
+        int | float | None: The estimated number of combinations (see PasswordFeatures.combinations)
     """
-    # Get the character set size
-    charset_size = calculate_charset_size(password)
-    
-    # Calculate the number of possible combinations
-    combinations = charset_size ** len(password)
-    
-    return combinations
+    return features.combinations()
 
-def estimate_dictionary_time(password):
+def estimate_dictionary_time(features):
     """
     Estimate the time to crack a password using dictionary + rules approach.
     
     Args:
-        password (str): The password to analyze
+        features (PasswordFeatures): Features of the password to analyze
         
     Returns:
         dict: Dictionary with time estimates
@@ -204,7 +278,7 @@ def estimate_dictionary_time(password):
     }
     
     # Estimate based on password complexity
-    complexity = get_password_complexity(password)
+    complexity = get_password_complexity(features)
     
     if complexity == "very_weak":
         crackability = "Likely in common dictionary"
@@ -238,46 +312,30 @@ def estimate_dictionary_time(password):
         "time_offline": format_time(time_offline)
     }
 
-def get_password_complexity(password):
+def get_password_complexity(features):
     """
     Get the complexity level of a password.
     
     Args:
-        password (str): The password to analyze
+        features (PasswordFeatures): Features of the password to analyze
         
     Returns:
         str: The complexity level ("very_weak", "weak", "medium", "strong", "very_strong")
     """
-    length = len(password)
-    has_lower = bool(re.search(r'[a-z]', password))
-    has_upper = bool(re.search(r'[A-Z]', password))
-    has_digit = bool(re.search(r'\d', password))
-    has_special = bool(re.search(r'[^a-zA-Z0-9]', password))
-    
-    char_types = sum([has_lower, has_upper, has_digit, has_special])
-    
-    if length < 6:
-        return "very_weak"
-    elif length < 8 or char_types < 2:
-        return "weak"
-    elif length < 10 or char_types < 3:
-        return "medium"
-    elif length < 12 or char_types < 4:
-        return "strong"
-    else:
-        return "very_strong"
+    level = min(bisect.bisect_right(_COMPLEXITY_LENGTHS, features.length), _TYPE_CAP[features.char_types])
+    return _COMPLEXITY_LEVELS[level]
 
-def get_complexity_description(password):
+def get_complexity_description(features):
     """
     Get a description of the password complexity.
     
     Args:
-        password (str): The password to analyze
+        features (PasswordFeatures): Features of the password to analyze
         
     Returns:
         str: Description of the password complexity
     """
-    complexity = get_password_complexity(password)
+    complexity = get_password_complexity(features)
     
     descriptions = {
         "very_weak": "Very Weak: This password could be cracked almost instantly.",
@@ -299,22 +357,19 @@ def format_time(seconds):
     Returns:
         str: A human-readable time string
     """
-    if seconds < 1:
-        return "less than a second"
-    elif seconds < 60:
-        return f"{seconds:.1f} seconds"
-    elif seconds < 3600:
-        minutes = seconds / 60
-        return f"{minutes:.1f} minutes"
-    elif seconds < 86400:
-        hours = seconds / 3600
-        return f"{hours:.1f} hours"
-    elif seconds < 2592000:
-        days = seconds / 86400
-        return f"{days:.1f} days"
-    elif seconds < 31536000:
-        months = seconds / 2592000
-        return f"{months:.1f} months"
-    else:
-        years = seconds / 31536000
-        return f"{years:.1f} years" 
\ No newline at end of file
+    idx = bisect.bisect_right(_THRESHOLDS, seconds)
+    if idx == 0:
+        return _LABELS[0]
+    return f"{seconds / _DIVISORS[idx]:.1f} {_LABELS[idx]}"
+
+def format_log_time(log_seconds):
+    """
+    Format a time given as the natural log of seconds to a human-readable string.
+    
+    Args:
+        log_seconds (float): ln of the time in seconds
+        
+    Returns:
+        str: A human-readable time string
+    """
+    return format_time(math.exp(min(log_seconds, _MAX_LOG_SECONDS)))
@@ -1,27 +1,78 @@
 import re
+import math
 import random
 import string
 import json
-from models.entropy import get_strength_score, calculate_charset_size
+from functools import lru_cache
+from models.entropy import get_strength_score, PasswordFeatures
 
-def generate_strength_graph(password):
+# Well-known weak passwords shown for comparison in the strength graph
+COMMON_PASSWORDS = (
+    "123456", "password", "123456789", "qwerty", "12345", "12345678",
+    "111111", "123123", "admin", "welcome", "password1", "1234",
+    "P@ssw0rd", "letmein", "abc123", "monkey", "sunshine", "football",
+    "iloveyou", "123", "welcome1", "passw0rd", "zaq1zaq1", "1qaz2wsx",
+    "qwertyuiop", "asdfghjkl", "login", "123qwe", "trustno1",
+)
+
+# Pattern checks for analyze_password_composition, built once at import
+_SEQUENCES = ("abcdefghijklmnopqrstuvwxyz", "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "0123456789")
+_SEQUENCE_TRIGRAMS = tuple(tuple(seq[i:i+3] for i in range(len(seq) - 2)) for seq in _SEQUENCES)
+_ALL_SEQUENCE_TRIGRAMS = frozenset(t for trigrams in _SEQUENCE_TRIGRAMS for t in trigrams)
+_REPEAT_RE = re.compile(r'(.)\1\1+')
+# Terms are reported in list order, not by position in the password
+_KEYBOARD_PATTERNS = ("qwerty", "asdfgh", "zxcvbn")
+_COMMON_WORDS = ("password", "admin", "user", "login", "welcome")
+_KEYBOARD_RE = re.compile("|".join(_KEYBOARD_PATTERNS))
+_COMMON_WORD_RE = re.compile("|".join(_COMMON_WORDS))
+
+# ln of the crack-time unit boundaries in seconds
+_LOG_MINUTE = math.log(60)
+_LOG_HOUR = math.log(3600)
+_LOG_DAY = math.log(86400)
+_LOG_YEAR = math.log(31536000)
+_LOG_CENTURY = math.log(31536000 * 100)
+
+# Strength categories and colors for each 20-point score band
+_STRENGTH_CATEGORIES = ("very weak", "weak", "medium", "strong", "very strong")
+_STRENGTH_COLORS = (
+    "#FF0000",  # Red
+    "#FF6600",  # Orange
+    "#FFCC00",  # Yellow
+    "#99CC00",  # Light Green
+    "#00CC00",  # Green
+)
+
+@lru_cache(maxsize=1)
+def _common_password_scores():
+    """
+    Score the fixed comparison passwords once; the result never changes.
+    Computed on first use rather than at import so the ML model still loads lazily.
+    
+    Returns:
+        tuple: Dicts with "password" and "score" keys
+    """
+    return tuple({"password": p, "score": get_strength_score(p)} for p in COMMON_PASSWORDS)
+
+def generate_strength_graph(password, features=None):
     """
     Generate data for visualizing password strength.
     
     Args:
         password (str): The password to analyze
+        features (PasswordFeatures, optional): Precomputed features of the password
         
     Returns:
         dict: Data for visualizing password strength
     """
+    if features is None:
+        features = PasswordFeatures.from_password(password)
+    
     # Calculate the password strength score (0-100)
     strength_score = get_strength_score(password)
     
-    # Calculate character set size
-    charset_size = calculate_charset_size(password)
-    
     # Analyze password composition
-    composition = analyze_password_composition(password)
+    composition = analyze_password_composition(password, features)
     
     # Generate data for the strength meter
     strength_meter = {
@@ -30,50 +81,20 @@ def generate_strength_graph(password):
         "color": get_strength_color(strength_score)
     }
     
-    # Generate comparison data with common passwords
-    common_passwords = [
-    {"password": "123456", "score": get_strength_score("123456")},
-    {"password": "password", "score": get_strength_score("password")},
-    {"password": "123456789", "score": get_strength_score("123456789")},
-    {"password": "qwerty", "score": get_strength_score("qwerty")},
-    {"password": "12345", "score": get_strength_score("12345")},
-    {"password": "12345678", "score": get_strength_score("12345678")},
-    {"password": "111111", "score": get_strength_score("111111")},
-    {"password": "123123", "score": get_strength_score("123123")},
-    {"password": "admin", "score": get_strength_score("admin")},
-    {"password": "welcome", "score": get_strength_score("welcome")},
-    {"password": "password1", "score": get_strength_score("password1")},
-    {"password": "1234", "score": get_strength_score("1234")},
-    {"password": "P@ssw0rd", "score": get_strength_score("P@ssw0rd")},
-    {"password": "letmein", "score": get_strength_score("letmein")},
-    {"password": "abc123", "score": get_strength_score("abc123")},
-    {"password": "monkey", "score": get_strength_score("monkey")},
-    {"password": "sunshine", "score": get_strength_score("sunshine")},
-    {"password": "football", "score": get_strength_score("football")},
-    {"password": "iloveyou", "score": get_strength_score("iloveyou")},
-    {"password": "123", "score": get_strength_score("123")},
-    {"password": "welcome1", "score": get_strength_score("welcome1")},
-    {"password": "passw0rd", "score": get_strength_score("passw0rd")},
-    {"password": "zaq1zaq1", "score": get_strength_score("zaq1zaq1")},
-    {"password": "1qaz2wsx", "score": get_strength_score("1qaz2wsx")},
-    {"password": "qwertyuiop", "score": get_strength_score("qwertyuiop")},
-    {"password": "asdfghjkl", "score": get_strength_score("asdfghjkl")},
-    {"password": "login", "score": get_strength_score("login")},
-    {"password": "123qwe", "score": get_strength_score("123qwe")},
-    {"password": "trustno1", "score": get_strength_score("trustno1")},
-]
-
+    # Comparison data with common passwords (scored once per process)
+    common_passwords = list(_common_password_scores())
     
     # Generate data for entropy visualization
     entropy_data = {
-        "password_length": len(password),
-        "charset_size": charset_size,
-        "possible_combinations": charset_size ** len(password) if charset_size > 0 else 0,
+        "password_length": features.length,
+        "charset_size": features.charset_size,
+        "possible_combinations": features.combinations(),
+        "possible_combinations_log10": round(features.log10_combinations, 2),
         "composition": composition
     }
     
     # Generate data for time-to-crack visualization based on different methods
-    crack_time_data = generate_crack_time_data(password)
+    crack_time_data = generate_crack_time_data(features)
     
     return {
         "strength_meter": strength_meter,
@@ -82,24 +103,36 @@ def generate_strength_graph(password):
         "crack_time_data": crack_time_data
     }
 
-def analyze_password_composition(password):
+def analyze_password_composition(password, features=None):
     """
     Analyze the composition of a password.
     
     Args:
         password (str): The password to analyze
+        features (PasswordFeatures, optional): Precomputed features of the password
         
     Returns:
         dict: Analysis of password composition
     """
-    # Count different character types
-    lowercase_count = sum(1 for c in password if c.islower())
-    uppercase_count = sum(1 for c in password if c.isupper())
-    digit_count = sum(1 for c in password if c.isdigit())
-    special_count = sum(1 for c in password if not c.isalnum())
+    if features is None:
+        features = PasswordFeatures.from_password(password)
+    
+    if password.isascii():
+        # ASCII classes from the shared translate/count pass
+        lowercase_count = features.lowercase_count
+        uppercase_count = features.uppercase_count
+        digit_count = features.digit_count
+        special_count = features.special_count
+    else:
+        # Unicode-aware counts so letters such as 'É' or 'ü' are shown as
+        # letters rather than special characters
+        lowercase_count = sum(1 for c in password if c.islower())
+        uppercase_count = sum(1 for c in password if c.isupper())
+        digit_count = sum(1 for c in password if c.isdigit())
+        special_count = sum(1 for c in password if not c.isalnum())
     
     # Calculate percentages
-    total_length = len(password)
+    total_length = features.length
     composition = {
         "lowercase": {
             "count": lowercase_count,
@@ -122,31 +155,32 @@ def analyze_password_composition(password):
     # Check for patterns
     patterns = []
     
-    # Check for sequential characters
-    sequences = ["abcdefghijklmnopqrstuvwxyz", "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "0123456789"]
-    for seq in sequences:
-        for i in range(len(seq) - 2):
-            if seq[i:i+3] in password:
-                patterns.append(f"Sequential characters: {seq[i:i+3]}")
-                break
+    # Check for sequential characters: intersect the password's 3-grams with
+    # every sequence trigram, then report the first hit of each sequence
+    found = {password[i:i+3] for i in range(len(password) - 2)} & _ALL_SEQUENCE_TRIGRAMS
+    if found:
+        for trigrams in _SEQUENCE_TRIGRAMS:
+            for trigram in trigrams:
+                if trigram in found:
+                    patterns.append(f"Sequential characters: {trigram}")
+                    break
     
     # Check for repeated characters
-    if re.search(r'(.)\1\1+', password):
+    if _REPEAT_RE.search(password):
         patterns.append("Repeated characters")
     
-    # Check for keyboard patterns
-    keyboard_patterns = ["qwerty", "asdfgh", "zxcvbn"]
-    for pattern in keyboard_patterns:
-        if pattern.lower() in password.lower():
-            patterns.append(f"Keyboard pattern: {pattern}")
-            break
+    lower_pwd = password.lower()
+    
+    # Check for keyboard patterns; one regex scan, then the list order
+    # decides which term is reported when several occur
+    if _KEYBOARD_RE.search(lower_pwd):
+        pattern = next(p for p in _KEYBOARD_PATTERNS if p in lower_pwd)
+        patterns.append(f"Keyboard pattern: {pattern}")
     
     # Check for common words
-    common_words = ["password", "admin", "user", "login", "welcome"]
-    for word in common_words:
-        if word.lower() in password.lower():
-            patterns.append(f"Common word: {word}")
-            break
+    if _COMMON_WORD_RE.search(lower_pwd):
+        word = next(w for w in _COMMON_WORDS if w in lower_pwd)
+        patterns.append(f"Common word: {word}")
     
     composition["patterns"] = patterns
     
@@ -162,16 +196,7 @@ def get_strength_category(score):
     Returns:
         str: The password strength category
     """
-    if score < 20:
-        return "very weak"
-    elif score < 40:
-        return "weak"
-    elif score < 60:
-        return "medium"
-    elif score < 80:
-        return "strong"
-    else:
-        return "very strong"
+    return _STRENGTH_CATEGORIES[_strength_band(score)]
 
 def get_strength_color(score):
     """
@@ -183,23 +208,18 @@ def get_strength_color(score):
     Returns:
         str: Hex color code representing the strength
     """
-    if score < 20:
-        return "#FF0000"  # Red
-    elif score < 40:
-        return "#FF6600"  # Orange
-    elif score < 60:
-        return "#FFCC00"  # Yellow
-    elif score < 80:
-        return "#99CC00"  # Light Green
-    else:
-        return "#00CC00"  # Green
+    return _STRENGTH_COLORS[_strength_band(score)]
+
+def _strength_band(score):
+    """Index of the 20-point band a 0-100 score falls in (0-4)."""
+    return min(max(int(score // 20), 0), 4)
 
-def generate_crack_time_data(password):
+def generate_crack_time_data(features):
     """
     Generate data for visualizing password cracking time.
     
     Args:
-        password (str): The password to analyze
+        features (PasswordFeatures): Features of the password to analyze
         
     Returns:
         dict: Data for visualizing password cracking time
@@ -213,35 +233,38 @@ def generate_crack_time_data(password):
         "quantum_computer": 1000000000000  # Hypothetical quantum computer
     }
     
-    # Calculate the number of possible combinations
-    charset_size = calculate_charset_size(password)
-    combinations = charset_size ** len(password)
+    # Times are compared in log space, so the combination count is never
+    # materialized as a huge integer
+    log_combinations = features.log_combinations
     
     # Estimate the time to crack for each attack speed
     crack_times = {}
     for attack, speed in attack_speeds.items():
         # Average case is half the keyspace
-        seconds = (combinations / 2) / speed
+        log_seconds = log_combinations - math.log(2 * speed)
         
         # Format the time
-        if seconds < 60:
-            time_str = f"{seconds:.1f} seconds"
-        elif seconds < 3600:
-            time_str = f"{seconds / 60:.1f} minutes"
-        elif seconds < 86400:
-            time_str = f"{seconds / 3600:.1f} hours"
-        elif seconds < 31536000:
-            time_str = f"{seconds / 86400:.1f} days"
-        elif seconds < 31536000 * 100:
-            time_str = f"{seconds / 31536000:.1f} years"
-        else:
+        if log_seconds >= _LOG_CENTURY:
             time_str = "centuries"
+        else:
+            seconds = math.exp(log_seconds)
+            if log_seconds < _LOG_MINUTE:
+                time_str = f"{seconds:.1f} seconds"
+            elif log_seconds < _LOG_HOUR:
+                time_str = f"{seconds / 60:.1f} minutes"
+            elif log_seconds < _LOG_DAY:
+                time_str = f"{seconds / 3600:.1f} hours"
+            elif log_seconds < _LOG_YEAR:
+                time_str = f"{seconds / 86400:.1f} days"
+            else:
+                time_str = f"{seconds / 31536000:.1f} years"
         
         crack_times[attack] = time_str
     
     return {
         "crack_times": crack_times,
-        "combinations": combinations
+        "combinations": features.combinations(),
+        "combinations_log10": round(features.log10_combinations, 2)
     }
 
 def generate_sample_passwords(count=10, min_length=8, max_length=16):
@@ -269,7 +292,7 @@ def generate_sample_passwords(count=10, min_length=8, max_length=16):
     for _ in range(weak_count):
         length = random.randint(4, 7)
         char_set = random.choice([lowercase, digits])
-        password = ''.join(random.choice(char_set) for _ in range(length))
+        password = ''.join(random.choices(char_set, k=length))
         score = get_strength_score(password)
         passwords.append({"password": password, "score": score})
     
@@ -278,7 +301,7 @@ def generate_sample_passwords(count=10, min_length=8, max_length=16):
     for _ in range(medium_count):
         length = random.randint(8, 10)
         char_set = lowercase + uppercase + digits
-        password = ''.join(random.choice(char_set) for _ in range(length))
+        password = ''.join(random.choices(char_set, k=length))
         score = get_strength_score(password)
         passwords.append({"password": password, "score": score})
     
@@ -287,7 +310,7 @@ def generate_sample_passwords(count=10, min_length=8, max_length=16):
     for _ in range(strong_count):
         length = random.randint(12, max_length)
         char_set = lowercase + uppercase + digits + special
-        password = ''.join(random.choice(char_set) for _ in range(length))
+        password = ''.join(random.choices(char_set, k=length))
         score = get_strength_score(password)
         passwords.append({"password": password, "score": score})
     